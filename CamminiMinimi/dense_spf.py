@@ -0,0 +1,232 @@
+import math
+import os
+
+from spf import UnknownCostError, IncorrectParametersError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# the number of rows of the cost matrix updated at once by a single step of the algorithm
+BLOCK_SIZE = 256
+
+
+class DenseSPF:
+    """
+    The class representing the all-pairs minimal paths of a small dense graph computed with the vectorized
+    Floyd-Warshall algorithm on the NumPy cost and next-hop matrices.
+    """
+
+    def __init__(self, graph, max_bytes=None):
+        """
+        The constructor of a new dense SPF object.
+        By default the memory limit is equal to the size of the available physical memory.
+
+        :type graph: Graph
+        :param graph: the graph to be considered
+
+        :type max_bytes: int
+        :param max_bytes: the maximal number of bytes the matrices can use
+        """
+
+        self.__graph = graph
+        self.__max_bytes = max_bytes
+        self.__numbers = {}
+        self.__vertices = []
+        self.__costs = None
+        self.__next = None
+        self.__integer = False
+
+    def get_required_bytes(self):
+        """
+        Gets the number of bytes required by the matrices of the graph.
+
+        :rtype: int
+        :return: the number of bytes required by the matrices
+        """
+
+        n = self.__graph.get_num_vertices()
+        # the cost matrix (doubles), the next-hop matrix (32-bit integers) and the temporary blocks of the rows
+        return n * n * (8 + 4) + min(n, BLOCK_SIZE) * n * (8 + 1 + 4)
+
+    def minimal_paths(self):
+        """
+        Calculates the minimal paths between all the pairs of the nodes of the graph and saves the result in the cost
+        matrix and the next-hop matrix.
+        """
+
+        try:
+            if np is None:
+                raise MissingDependencyError
+
+            max_bytes = self.__max_bytes
+            if max_bytes is None and hasattr(os, "sysconf"):
+                max_bytes = os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+            if max_bytes is not None and self.get_required_bytes() > max_bytes:
+                raise MatrixSizeError
+
+            self.__vertices = list(self.__graph.get_vertices())
+            self.__numbers = {v: i for i, v in enumerate(self.__vertices)}
+            n = len(self.__vertices)
+
+            # at the beginning only the nodes connected by an arch can be reached
+            costs = np.full((n, n), math.inf)
+            nxt = np.full((n, n), -1, dtype=np.int32)
+            # the costs are reported as integers if all the weights are integers, as the SPF algorithm does
+            integer = True
+            for vs in self.__graph:
+                i = self.__numbers[vs.get_id()]
+                for vd in vs.get_connections():
+                    j = self.__numbers[vd.get_id()]
+                    if not isinstance(vs.get_weight(vd), int):
+                        integer = False
+                    if vs.get_weight(vd) < costs[i, j]:
+                        costs[i, j] = vs.get_weight(vd)
+                        nxt[i, j] = j
+
+            # by the convention the cost to reach the node from itself is equal to 0
+            index = np.arange(n)
+            costs[index, index] = 0
+            nxt[index, index] = index
+
+            # do for each intermediate node k
+            for k in range(n):
+                row = costs[k]
+                for b in range(0, n, BLOCK_SIZE):
+                    block = costs[b:b + BLOCK_SIZE]
+                    # the costs of the paths going through the node k
+                    via = block[:, k, None] + row
+                    shorter = via < block
+                    np.copyto(block, via, where=shorter)
+                    np.copyto(nxt[b:b + BLOCK_SIZE], nxt[b:b + BLOCK_SIZE, k, None], where=shorter)
+
+            self.__costs = costs
+            self.__integer = integer
+            self.__next = nxt
+
+        except MissingDependencyError:
+            print("Error: The NumPy package is required to calculate the minimal paths of the dense graph.")
+
+        except MatrixSizeError:
+            print("Error: The matrices of the graph require %d bytes, which exceeds the available memory."
+                  % self.get_required_bytes())
+
+        except MemoryError:
+            self.__costs = None
+            self.__next = None
+            print("Error: The matrices of the graph do not fit in memory.")
+
+        except Exception:
+            print("Error: The minimal paths cannot be calculated.")
+
+    def get_cost(self, frm, to):
+        """
+        Gets the cost of the minimal path between the given nodes.
+
+        :type frm: str
+        :param frm: the id of the source node
+
+        :type to: str
+        :param to: the id of the destination node
+
+        :rtype: float
+        :return: the cost of the minimal path between the given nodes
+        """
+
+        try:
+            if self.__costs is None:
+                raise UnknownCostError
+            elif frm not in self.__numbers or to not in self.__numbers:
+                raise IncorrectParametersError
+
+            i = self.__numbers[frm]
+            j = self.__numbers[to]
+            # by the convention the cost to reach the node from itself is equal to 0
+            if i == j:
+                return 0
+
+            co = float(self.__costs[i, j])
+            if self.__integer and co != math.inf:
+                return int(co)
+            return co
+
+        except UnknownCostError:
+            print("Error: The minimal paths has not been calculated.")
+            return math.inf
+
+        except IncorrectParametersError:
+            print("Error: The \"%s\" or \"%s\" node is not a part of the given graph." % (frm, to))
+            return math.inf
+
+        except Exception:
+            print("Error: The cost from the node \"%s\" to the node \"%s\" cannot be returned." % (frm, to))
+            return math.inf
+
+    def get_path(self, frm, to):
+        """
+        Gets the minimal path between the given nodes read from the next-hop matrix.
+
+        :type frm: str
+        :param frm: the id of the source node
+
+        :type to: str
+        :param to: the id of the destination node
+
+        :rtype: str
+        :return: the minimal path between the given nodes
+        """
+
+        try:
+            if self.__next is None:
+                raise UnknownCostError
+            elif frm not in self.__numbers or to not in self.__numbers:
+                raise IncorrectParametersError
+
+            i = self.__numbers[frm]
+            j = self.__numbers[to]
+            if self.__next[i, j] < 0:
+                raise UnknownCostError
+
+            path = [frm]
+            while i != j:
+                i = int(self.__next[i, j])
+                path.append(self.__vertices[i])
+
+            return "Path: [" + " -> ".join(path) + "] Cost: " + str(self.get_cost(frm, to))
+
+        except IncorrectParametersError:
+            print("Error: The \"%s\" or \"%s\" node is not a part of the given graph." % (frm, to))
+            return ""
+
+        except UnknownCostError:
+            print("Error: The minimal path from the node \"%s\" to the node \"%s\" is not known." % (frm, to))
+            return ""
+
+        except Exception:
+            print("Error: The minimal path from the node \"%s\" to the node \"%s\" cannot be returned." % (frm, to))
+            return ""
+
+    def get_graph(self):
+        """
+        Gets the graph
+
+        :rtype: Graph
+        :return: the graph.
+        """
+
+        return self.__graph
+
+
+class MissingDependencyError(Exception):
+    """ The optional package is not installed. """
+
+    def __init__(self):
+        self.args = ("The optional package is not installed.",)
+
+
+class MatrixSizeError(Exception):
+    """ The matrices of the graph do not fit in memory. """
+
+    def __init__(self):
+        self.args = ("The matrices of the graph do not fit in memory.",)
@@ -0,0 +1,298 @@
+import heapq
+import json
+import math
+import random
+
+from spf import UnknownCostError, IncorrectParametersError
+
+
+class DistanceOracle:
+    """
+    The class representing the approximate distance oracle of Thorup and Zwick.
+    For a given k the oracle answers the cost queries in O(k) time with the stretch of at most 2k - 1 and keeps
+    O(k * n^(1 + 1/k)) entries on average.
+    """
+
+    def __init__(self, k=2, seed=None):
+        """
+        The constructor of a new distance oracle object.
+        By default k is equal to 2 so the estimated costs are at most 3 times greater than the exact ones.
+
+        :type k: int
+        :param k: the number of the levels of the sampled landmarks
+
+        :type seed: int
+        :param seed: the seed of the landmark sampling
+        """
+
+        self.__k = k
+        self.__seed = seed
+        self.__vertices = []
+        self.__numbers = {}
+        # for each level i and vertex v the number of the nearest landmark of the level i and the cost to reach it
+        self.__pivots = []
+        self.__pivot_costs = []
+        # for each vertex v the dictionary that contains pairs like (w : c) where w is the number of the landmark in
+        # the bunch of v and c is the cost of the minimal path between w and v
+        self.__bunches = []
+
+    def build(self, graph):
+        """
+        Builds the oracle for the given graph.
+
+        :type graph: Graph
+        :param graph: the graph to be considered
+
+        :rtype: int
+        :return: the flag describing whether the oracle has been built (1) or not (0)
+        """
+
+        try:
+            if self.__k < 1:
+                raise ValueError
+
+            vertices = list(graph.get_vertices())
+            numbers = {v: i for i, v in enumerate(vertices)}
+            adjacent = [[] for _ in vertices]
+            for vs in graph:
+                for vd in vs.get_connections():
+                    adjacent[numbers[vs.get_id()]].append((numbers[vd.get_id()], vs.get_weight(vd)))
+
+            # sample the landmarks so that the landmarks of the level k - 1 are not empty
+            n = len(vertices)
+            rng = random.Random(self.__seed)
+            levels = [list(range(n))]
+            for i in range(1, self.__k):
+                sample = [v for v in levels[-1] if rng.random() < n ** (-1 / self.__k)]
+                while not sample and levels[-1]:
+                    sample = [v for v in levels[-1] if rng.random() < n ** (-1 / self.__k)]
+                levels.append(sample)
+            levels.append([])
+
+            # the nearest landmark of each level, the costs to the empty level k are infinite
+            pivot_costs = [None] * (self.__k + 1)
+            pivots = [None] * (self.__k + 1)
+            pivot_costs[self.__k] = [math.inf] * n
+            pivots[self.__k] = [None] * n
+            for i in range(self.__k - 1, -1, -1):
+                nearest, costs = _restricted_search(adjacent, levels[i], pivot_costs[self.__k])
+                pivots[i] = [None] * n
+                pivot_costs[i] = [math.inf] * n
+                for v, co in costs.items():
+                    pivots[i][v] = nearest[v]
+                    pivot_costs[i][v] = co
+                for v in range(n):
+                    # on a tie the landmark of the higher level is preferred so that it belongs to the bunch
+                    if pivot_costs[i][v] == pivot_costs[i + 1][v]:
+                        pivots[i][v] = pivots[i + 1][v]
+
+            # the bunches are built from the clusters of the landmarks
+            bunches = [{} for _ in vertices]
+            for i in range(self.__k):
+                upper = set(levels[i + 1])
+                for w in levels[i]:
+                    if w in upper:
+                        continue
+                    # only the vertices of the cluster are visited
+                    _, cluster = _restricted_search(adjacent, [w], pivot_costs[i + 1])
+                    for v, co in cluster.items():
+                        if co < pivot_costs[i + 1][v]:
+                            bunches[v][w] = co
+
+            self.__vertices = vertices
+            self.__numbers = numbers
+            self.__pivots = pivots[:self.__k]
+            self.__pivot_costs = pivot_costs[:self.__k]
+            self.__bunches = bunches
+
+            return 1
+
+        except ValueError:
+            print("Error: The number of the levels of the oracle has to be positive.")
+            return 0
+
+        except Exception:
+            print("Error: The distance oracle cannot be built.")
+            return 0
+
+    def get_cost(self, frm, to):
+        """
+        Gets the estimated cost of the minimal path between the given nodes.
+        The estimated cost is at least the exact cost and at most 2k - 1 times greater.
+
+        :type frm: str
+        :param frm: the id of the source node
+
+        :type to: str
+        :param to: the id of the destination node
+
+        :rtype: float
+        :return: the estimated cost of the minimal path between the given nodes
+        """
+
+        try:
+            if not self.__bunches:
+                raise UnknownCostError
+            elif frm not in self.__numbers or to not in self.__numbers:
+                raise IncorrectParametersError
+
+            u = self.__numbers[frm]
+            v = self.__numbers[to]
+            w = u
+            i = 0
+            while w not in self.__bunches[v]:
+                i = i + 1
+                if i == self.__k:
+                    # the nodes are not connected
+                    return math.inf
+                u, v = v, u
+                w = self.__pivots[i][u]
+
+            return self.__pivot_costs[i][u] + self.__bunches[v][w]
+
+        except UnknownCostError:
+            print("Error: The distance oracle has not been built.")
+            return math.inf
+
+        except IncorrectParametersError:
+            print("Error: The \"%s\" or \"%s\" node is not a part of the given graph." % (frm, to))
+            return math.inf
+
+        except Exception:
+            print("Error: The cost from the node \"%s\" to the node \"%s\" cannot be returned." % (frm, to))
+            return math.inf
+
+    def get_k(self):
+        """
+        Gets the number of the levels of the oracle.
+
+        :rtype: int
+        :return: the number of the levels
+        """
+
+        return self.__k
+
+    def get_size(self):
+        """
+        Gets the number of the entries of the bunches.
+
+        :rtype: int
+        :return: the number of the entries of the bunches
+        """
+
+        return sum(len(b) for b in self.__bunches)
+
+    def save(self, filepath):
+        """
+        Saves the index of the oracle to the JSON file.
+
+        :type filepath: str
+        :param filepath: the location of the output file
+
+        :rtype: int
+        :return: the flag describing whether the oracle has been saved (1) or not (0)
+        """
+
+        try:
+            if not self.__bunches:
+                raise UnknownCostError
+
+            index = {
+                "k": self.__k,
+                "vertices": self.__vertices,
+                "pivots": self.__pivots,
+                "pivot_costs": self.__pivot_costs,
+                "bunches": [list(b.items()) for b in self.__bunches],
+            }
+            with open(filepath, "w") as fp:
+                json.dump(index, fp)
+
+            return 1
+
+        except UnknownCostError:
+            print("Error: The distance oracle has not been built.")
+            return 0
+
+        except IOError:
+            print("Error: The file cannot be written.")
+            return 0
+
+        except Exception:
+            print("Error: The distance oracle cannot be saved.")
+            return 0
+
+    @staticmethod
+    def load(filepath):
+        """
+        Loads the index of the oracle from the JSON file.
+
+        :type filepath: str
+        :param filepath: the location of the input file
+
+        :rtype: DistanceOracle
+        :return: the loaded oracle (None if the oracle cannot be loaded)
+        """
+
+        try:
+            with open(filepath, "r") as fp:
+                index = json.load(fp)
+
+            oracle = DistanceOracle(index["k"])
+            oracle.__vertices = index["vertices"]
+            oracle.__numbers = {v: i for i, v in enumerate(oracle.__vertices)}
+            oracle.__pivots = index["pivots"]
+            oracle.__pivot_costs = index["pivot_costs"]
+            oracle.__bunches = [{w: co for w, co in b} for b in index["bunches"]]
+
+            return oracle
+
+        except IOError:
+            print("Error: The file does not appear to exist.")
+            return None
+
+        except Exception:
+            print("Error: The distance oracle cannot be loaded.")
+            return None
+
+
+def _restricted_search(adjacent, sources, limits):
+    """
+    Calculates the minimal paths from the nearest of the given sources, visiting only the vertices which can be
+    reached with the cost lower than their limit. The work is proportional to the number of the visited vertices and
+    their arches.
+
+    :type adjacent: list
+    :param adjacent: for each vertex the list of the (neighbor, weight) pairs
+
+    :type sources: list
+    :param sources: the numbers of the source vertices
+
+    :type limits: list
+    :param limits: for each vertex the cost which has to be exceeded to visit it
+
+    :rtype: tuple
+    :return: the dictionaries that contain pairs like (v : s) where s is the nearest source of the visited vertex v and
+    pairs like (v : c) where c is the cost to reach the visited vertex v
+    """
+
+    nearest = {}
+    costs = {}
+    heap = []
+    for s in sources:
+        nearest[s] = s
+        costs[s] = 0
+        heap.append((0, s))
+    heapq.heapify(heap)
+
+    while heap:
+        co, v = heapq.heappop(heap)
+        if co > costs[v]:
+            continue
+        for w, weight in adjacent[v]:
+            new = co + weight
+            if new < costs.get(w, math.inf) and new < limits[w]:
+                costs[w] = new
+                nearest[w] = nearest[v]
+                heapq.heappush(heap, (new, w))
+
+    return nearest, costs
@@ -1,3 +1,10 @@
+import os
+import sys
+from array import array
+from itertools import repeat
+from multiprocessing import Pool
+
+
 class Vertex:
     """
     The class representing a vertex.
@@ -38,6 +45,29 @@ class Vertex:
 
         self.__adjacent[neighbor] = weight
 
+    def add_neighbors(self, neighbors, weights):
+        """
+        Adds new edges between this vertex and the given ones in a single step.
+
+        :type neighbors: iterable
+        :param neighbors: the given vertices
+
+        :type weights: iterable
+        :param weights: the weights of the edges
+        """
+
+        self.__adjacent.update(zip(neighbors, weights))
+
+    def remove_neighbor(self, neighbor):
+        """
+        Removes the edge between this vertex and the given one.
+
+        :type neighbor: Vertex
+        :param neighbor: the given vertex
+        """
+
+        del self.__adjacent[neighbor]
+
     def get_connections(self):
         """
         Gets all the adjacent vertices of the vertex.
@@ -216,6 +246,139 @@ class Graph:
             print("Error: The input file cannot be read.")
             return 0
 
+    def load_graph_parallel(self, filepath, weighted=0, workers=None):
+        """
+        Loads the graph from the input txt file using several worker processes.
+        The "ARCS" section is split at newline boundaries into byte ranges. The worker processes stream their ranges,
+        tokenize the arches, parse the weights and group the arches by vertex. The parent process interns the ids and
+        adds the grouped arches with a single bulk update per vertex and range, in the file order, so this part
+        remains serial. The result is the same as the one of the load_graph method.
+
+        :type filepath: str
+        :param filepath: the location of the input file
+
+        :type weighted: int
+        :param weighted: the flag describing whether the graph is weighted (for all the non-zero values) or not (for 0)
+
+        :type workers: int
+        :param workers: the number of worker processes (by default the number of the available cores)
+
+        :rtype: int
+        :return: the flag describing whether the graph has been loaded (1) or not (0)
+        """
+
+        self.__weighted = weighted
+
+        num = 0
+        try:
+            with open(filepath, "rb") as fp:
+                line = fp.readline()
+
+                # read the header up to the "ARCS" keyword
+                while line and line.split()[0] != b"ARCS":
+                    if line.split()[0] == b"NODES":
+                        # read the number of nodes
+                        num = int(line.split()[1])
+                    line = fp.readline()
+
+                if not line:
+                    raise IndexError
+
+                start = fp.tell()
+                size = os.fstat(fp.fileno()).st_size
+
+                if workers is None:
+                    workers = os.cpu_count() or 1
+                workers = max(1, min(workers, (size - start) // PARALLEL_CHUNK_SIZE + 1))
+
+                # move the approximate bounds of the ranges to the next newline
+                bounds = [start]
+                for i in range(1, workers):
+                    fp.seek(start + (size - start) * i // workers)
+                    fp.readline()
+                    bounds.append(max(fp.tell(), bounds[-1]))
+                bounds.append(size)
+
+            ranges = [(filepath, bounds[i], bounds[i + 1], self.__weighted) for i in range(workers)]
+            if workers > 1:
+                with Pool(workers) as pool:
+                    chunks = pool.map(_parse_arcs_range, ranges)
+            else:
+                chunks = [_parse_arcs_range(ranges[0])]
+
+            # merge the parsed edges in the file order up to the "END" keyword
+            vert_dict = self.__vert_dict
+            for ids, offsets, neighbors, costs, stop, error in chunks:
+                # the errors of the ranges after the "END" keyword are not reached
+                if error is not None:
+                    raise error
+
+                # intern the ids local to the range so that every vertex keeps a single copy of its id
+                vertices = []
+                for vid in ids:
+                    vertex = vert_dict.get(vid)
+                    if vertex is None:
+                        vid = sys.intern(vid)
+                        vertex = vert_dict[vid] = Vertex(vid)
+                    vertices.append(vertex)
+
+                for i, vertex in enumerate(vertices):
+                    first = offsets[i]
+                    last = offsets[i + 1]
+                    vertex.add_neighbors(map(vertices.__getitem__, neighbors[first:last]),
+                                         costs[first:last] if costs is not None else repeat(0))
+
+                if stop is not None:
+                    break
+            else:
+                # the "END" keyword is missing
+                raise IndexError
+            self.__num_vertices = len(vert_dict)
+
+            # read the rest of the file after the "END" keyword
+            with open(filepath, "rb") as fp:
+                fp.seek(stop)
+                line = fp.readline()
+                while line:
+                    if line.split()[0] == b"NODES":
+                        # read the number of nodes
+                        num = int(line.split()[1])
+                    line = fp.readline()
+
+            # check whether the number of nodes is correctly defined
+            if num != self.__num_vertices:
+                raise NumberOfNodesError
+
+            return 1
+
+        except IOError:
+            self.__weighted = 0
+            self.__num_vertices = 0
+            self.__vert_dict = {}
+            print("Error: The file does not appear to exist.")
+            return 0
+
+        except IndexError:
+            self.__weighted = 0
+            self.__num_vertices = 0
+            self.__vert_dict = {}
+            print("Error: The arches defined in the input file are probably incorrect.")
+            return 0
+
+        except NumberOfNodesError:
+            self.__weighted = 0
+            self.__num_vertices = 0
+            self.__vert_dict = {}
+            print("Error: The format of the input file is incorrect.")
+            return 0
+
+        except Exception:
+            self.__weighted = 0
+            self.__num_vertices = 0
+            self.__vert_dict = {}
+            print("Error: The input file cannot be read.")
+            return 0
+
     def add_vertex(self, node):
         """
         Adds a new vertex to the graph.
@@ -264,6 +427,180 @@ class Graph:
         except Exception:
             print("Error: A new edge cannot be added.")
 
+    def remove_edge(self, frm, to):
+        """
+        Removes the edge between the given vertices. The vertices stay in the graph.
+
+        :type frm: str
+        :param frm: the id of the first vertex
+
+        :type to: str
+        :param to: the id of the second vertex
+        """
+
+        try:
+            if frm not in self.__vert_dict or to not in self.__vert_dict:
+                raise VertexIdError
+
+            vs = self.__vert_dict[frm]
+            vd = self.__vert_dict[to]
+            vs.remove_neighbor(vd)
+            vd.remove_neighbor(vs)
+
+        except VertexIdError:
+            print("Error: The vertex with \"%s\" or \"%s\" id does not exist." % (frm, to))
+
+        except Exception:
+            print("Error: The edge cannot be removed.")
+
+    def apply_delta(self, filepath):
+        """
+        Patches the graph in place with the changes from the delta txt file.
+        The file contains the optional "NODES" keyword with the number of nodes after the changes and the "DELTA"
+        section (closed by the "END" keyword) with the lines like "ADD i j c", "UPDATE i j c" or "REMOVE i j".
+        The vertices left without any edge are removed from the graph, since a vertex exists only as an end of an arch
+        of the input file. The changes are applied entirely or not at all.
+
+        :type filepath: str
+        :param filepath: the location of the delta file
+
+        :rtype: list
+        :return: the ids of the vertices touched by the changes (None if the delta has not been applied)
+        """
+
+        num = None
+        undo = []
+        touched = {}
+        try:
+            fp = open(filepath, "r")
+            line = fp.readline()
+
+            while line:
+                if line.split()[0] == "NODES":
+                    # read the number of nodes
+                    num = int(line.split()[1])
+
+                if line.split()[0] == "DELTA":
+                    line = fp.readline()
+
+                    # read the changes
+                    while line.split()[0] != "END":
+                        change = line.split()
+                        op = change[0]
+                        vs = change[1]
+                        vd = change[2]
+
+                        # check whether the graph is weighted
+                        co = 0
+                        if self.__weighted and op != "REMOVE":
+                            co = float(change[3])
+
+                        # ignore arches like (i, j) where i = j
+                        if vs != vd:
+                            self.__apply_change(op, vs, vd, co, undo)
+                            touched[vs] = None
+                            touched[vd] = None
+
+                        line = fp.readline()
+
+                line = fp.readline()
+
+            fp.close()
+
+            # check whether the number of nodes is correctly defined once the vertices without edges are removed
+            isolated = [v for v in touched if not self.__vert_dict[v].get_connections()]
+            if num is not None and num != self.__num_vertices - len(isolated):
+                raise NumberOfNodesError
+
+            for v in isolated:
+                del self.__vert_dict[v]
+            self.__num_vertices = self.__num_vertices - len(isolated)
+
+            return list(touched)
+
+        except IOError:
+            print("Error: The file does not appear to exist.")
+            return None
+
+        except IndexError:
+            self.__revert_changes(undo)
+            print("Error: The changes defined in the delta file are probably incorrect.")
+            return None
+
+        except DeltaError:
+            self.__revert_changes(undo)
+            print("Error: The changes defined in the delta file do not match the graph.")
+            return None
+
+        except NumberOfNodesError:
+            self.__revert_changes(undo)
+            print("Error: The format of the delta file is incorrect.")
+            return None
+
+        except Exception:
+            self.__revert_changes(undo)
+            print("Error: The delta file cannot be read.")
+            return None
+
+    def __apply_change(self, op, frm, to, cost, undo):
+        """
+        Applies a single change of the delta file and records how to revert it.
+
+        :type op: str
+        :param op: the kind of the change ("ADD", "UPDATE" or "REMOVE")
+
+        :type frm: str
+        :param frm: the id of the first vertex
+
+        :type to: str
+        :param to: the id of the second vertex
+
+        :type cost: float
+        :param cost: the new weight of the edge
+
+        :type undo: list
+        :param undo: the list of the (frm, to, old weight, new vertices) tuples, where the old weight is None for the
+        new edges and the new vertices are the ids of the vertices created by the change
+        """
+
+        old = None
+        if frm in self.__vert_dict and to in self.__vert_dict:
+            vs = self.__vert_dict[frm]
+            vd = self.__vert_dict[to]
+            if vd in vs.get_connections():
+                old = vs.get_weight(vd)
+
+        if op == "ADD" and old is None or op == "UPDATE" and old is not None:
+            created = [v for v in (frm, to) if v not in self.__vert_dict]
+            undo.append((frm, to, old, created))
+            self.add_edge(frm, to, cost)
+        elif op == "REMOVE" and old is not None:
+            undo.append((frm, to, old, []))
+            self.remove_edge(frm, to)
+        else:
+            raise DeltaError
+
+    def __revert_changes(self, undo):
+        """
+        Reverts the changes recorded by the __apply_change method.
+        The existing vertices are kept as they are and the created ones are removed, so the order of the vertices is
+        restored.
+
+        :type undo: list
+        :param undo: the list of the (frm, to, old weight, new vertices) tuples, where the old weight is None for the
+        new edges and the new vertices are the ids of the vertices created by the change
+        """
+
+        for frm, to, old, created in reversed(undo):
+            if old is None:
+                self.remove_edge(frm, to)
+            else:
+                self.add_edge(frm, to, old)
+
+            for v in reversed(created):
+                del self.__vert_dict[v]
+                self.__num_vertices = self.__num_vertices - 1
+
     def get_vert_dict(self):
         """
         Gets the dictionary representation of the vertices of the graph.
@@ -320,6 +657,100 @@ class Graph:
         return self.__vert_dict.keys()
 
 
+# the minimal number of bytes of the "ARCS" section parsed by a single worker process
+PARALLEL_CHUNK_SIZE = 1 << 20
+
+# the number of bytes read at once by a worker process
+PARALLEL_BLOCK_SIZE = 1 << 22
+
+
+def _parse_arcs_range(args):
+    """
+    Parses the arches from the given byte range of the input file, reading it in blocks of a fixed size.
+    The range has to start at the beginning of a line. The parsing stops at the "END" keyword.
+    The vertices are numbered locally to the range so that only the distinct ids are sent back to the parent process
+    and the arches are grouped by vertex in the file order (each arch is stored for both of its vertices).
+
+    :type args: tuple
+    :param args: the path of the input file, the first and the last byte of the range and the weighted flag
+
+    :rtype: tuple
+    :return: the distinct ids of the vertices, the offsets of the groups of the arches of each vertex, the local
+    numbers of the neighbors, the weights of the arches (None for the graph which is not weighted), the position
+    following the "END" keyword (None if it has not been reached) and the error raised while parsing (None if there
+    is no error)
+    """
+
+    filepath, begin, end, weighted = args
+    numbers = {}
+    sources = array("i")
+    targets = array("i")
+    costs = array("d")
+    stop = None
+    error = None
+
+    with open(filepath, "rb") as fp:
+        fp.seek(begin)
+        position = begin
+        remainder = b""
+        try:
+            while position < end and stop is None:
+                # read the range in blocks, the incomplete last line of a block is kept for the next one
+                block = fp.read(min(PARALLEL_BLOCK_SIZE, end - position))
+                offset = position - len(remainder)
+                position = position + len(block)
+                lines = (remainder + block).split(b"\n")
+                remainder = lines.pop()
+                if position >= end and remainder:
+                    # the last line of the file is not terminated
+                    lines.append(remainder)
+
+                for line in lines:
+                    offset = offset + len(line) + 1
+                    arch = line.split()
+                    if arch[0] == b"END":
+                        stop = offset
+                        break
+
+                    # check whether the graph is weighted
+                    if weighted:
+                        co = float(arch[2])
+
+                    # ignore arches like (i, j) where i = j
+                    if arch[0] != arch[1]:
+                        sources.append(numbers.setdefault(arch[0], len(numbers)))
+                        targets.append(numbers.setdefault(arch[1], len(numbers)))
+                        if weighted:
+                            costs.append(co)
+
+        except Exception as e:
+            # the error matters only if the range precedes the "END" keyword
+            error = e
+
+    # group the arches by vertex
+    offsets = array("i", bytes(4 * (len(numbers) + 1)))
+    for v in sources:
+        offsets[v + 1] = offsets[v + 1] + 1
+    for v in targets:
+        offsets[v + 1] = offsets[v + 1] + 1
+    for v in range(len(numbers)):
+        offsets[v + 1] = offsets[v + 1] + offsets[v]
+
+    fill = offsets[:-1]
+    neighbors = array("i", bytes(4 * offsets[-1]))
+    weights = array("d", bytes(8 * offsets[-1])) if weighted else None
+    for i, (vs, vd) in enumerate(zip(sources, targets)):
+        neighbors[fill[vs]] = vd
+        neighbors[fill[vd]] = vs
+        if weighted:
+            weights[fill[vs]] = costs[i]
+            weights[fill[vd]] = costs[i]
+        fill[vs] = fill[vs] + 1
+        fill[vd] = fill[vd] + 1
+
+    return [vid.decode() for vid in numbers], offsets, neighbors, weights, stop, error
+
+
 class NumberOfNodesError(Exception):
     """ The number of nodes defined by the keyword "NODES" is not equal to the number of nodes existing in the input
     file. """
@@ -343,6 +774,13 @@ class VertexIdError(Exception):
         self.args = ("The id of the vertex is incorrect.",)
 
 
+class DeltaError(Exception):
+    """ The change of the delta file does not match the graph. """
+
+    def __init__(self):
+        self.args = ("The change of the delta file does not match the graph.",)
+
+
 class LoadingError(Exception):
     """ The graph cannot be loaded. """
 
@@ -0,0 +1,98 @@
+import math
+import random
+import sys
+import time
+
+from distance_oracle import DistanceOracle
+from graph import Graph
+from spf import SPF
+
+
+def benchmark(graph, k=2, sources=10, seed=None):
+    """
+    Measures the stretch of the distance oracle built for the given graph against the exact costs calculated by the
+    SPF algorithm from the randomly chosen source nodes to all the other nodes.
+
+    :type graph: Graph
+    :param graph: the graph to be considered
+
+    :type k: int
+    :param k: the number of the levels of the oracle
+
+    :type sources: int
+    :param sources: the number of the source nodes
+
+    :type seed: int
+    :param seed: the seed of the landmark sampling and of the choice of the source nodes
+
+    :rtype: dict
+    :return: the build time, the average query time, the size of the oracle and the mean and the maximal stretch
+    (None if the oracle cannot be built)
+    """
+
+    oracle = DistanceOracle(k, seed)
+    start = time.perf_counter()
+    if not oracle.build(graph):
+        return None
+    build_time = time.perf_counter() - start
+
+    rng = random.Random(seed)
+    vertices = list(graph.get_vertices())
+    stretches = []
+    query_time = 0
+    for s in rng.sample(vertices, min(sources, len(vertices))):
+        spf = SPF(graph, s)
+        spf.minimal_paths()
+        for t in vertices:
+            exact = spf.get_cost(t)
+            start = time.perf_counter()
+            estimate = oracle.get_cost(s, t)
+            query_time = query_time + time.perf_counter() - start
+
+            # skip the pairs without a path and the pairs of the nodes with the cost equal to 0
+            if exact != math.inf and exact > 0:
+                stretches.append(estimate / exact)
+
+    return {
+        "build_time": build_time,
+        "query_time": query_time / max(1, min(sources, len(vertices)) * len(vertices)),
+        "size": oracle.get_size(),
+        "mean_stretch": sum(stretches) / len(stretches) if stretches else 1.0,
+        "max_stretch": max(stretches) if stretches else 1.0,
+    }
+
+
+def runner():
+    """
+    The entry point of the benchmark. The arguments are the path of the input file and optionally k and the number of
+    the source nodes.
+    """
+
+    try:
+        filepath = sys.argv[1]
+        k = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+        sources = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+
+    except Exception:
+        print("Usage: python oracle_benchmark.py <input file> [k] [sources]")
+        sys.exit(0)
+
+    g = Graph()
+    if not g.load_graph(filepath, 1):
+        print("Endpoint: The graph from the file \"%s\" cannot be loaded." % filepath)
+        sys.exit(0)
+
+    result = benchmark(g, k, sources)
+    if result is None:
+        print("Endpoint: The distance oracle cannot be built.")
+        sys.exit(0)
+
+    print("# Distance oracle benchmark (k = %d, %d nodes)\n" % (k, g.get_num_vertices()))
+    print("Build time: %.4f s" % result["build_time"])
+    print("Query time: %.2f us" % (result["query_time"] * 1e6))
+    print("Size: %d bunch entries" % result["size"])
+    print("Stretch: mean %.4f, max %.4f (bound %d)" % (result["mean_stretch"], result["max_stretch"], 2 * k - 1))
+
+
+if __name__ == '__main__':
+    runner()
@@ -0,0 +1,564 @@
+import heapq
+import math
+import os
+import zlib
+from collections import OrderedDict, deque
+
+from graph import Graph, LoadingError
+from spf import SPF, IncorrectParametersError
+
+
+def partition_graph(graph, directory, cell_size):
+    """
+    Splits the graph into cells of at most the given number of vertices grown by the breadth-first search and saves
+    them in the given directory.
+    Every cell is saved as a separate input file with the arches between its vertices, next to the boundary file of
+    the cell. The boundary file contains the arches leaving the cell and the shortcuts between the boundary nodes of
+    the cell, i.e. the costs of the minimal paths inside the cell which do not pass through another boundary node.
+    The assignment of the vertices to the cells is saved in bucket files chosen by the hash of the id.
+
+    :type graph: Graph
+    :param graph: the graph to be partitioned
+
+    :type directory: str
+    :param directory: the location of the output directory
+
+    :type cell_size: int
+    :param cell_size: the maximal number of vertices of a cell
+
+    :rtype: int
+    :return: the flag describing whether the graph has been partitioned (1) or not (0)
+    """
+
+    try:
+        if cell_size < 1:
+            raise ValueError
+
+        # grow the cells by the breadth-first search from the vertices not assigned yet
+        cell_of = {}
+        cells = []
+        for seed in graph:
+            if seed.get_id() in cell_of:
+                continue
+            cell = []
+            queue = deque([seed])
+            cell_of[seed.get_id()] = len(cells)
+            while queue:
+                v = queue.popleft()
+                cell.append(v)
+                for w in v.get_connections():
+                    if w.get_id() not in cell_of and len(cell) + len(queue) < cell_size:
+                        cell_of[w.get_id()] = len(cells)
+                        queue.append(w)
+            cells.append(cell)
+
+        os.makedirs(directory, exist_ok=True)
+        buckets = max(1, -(-len(cell_of) // cell_size))
+        _save_index(directory, cell_of, len(cells), buckets)
+
+        for c, cell in enumerate(cells):
+            inner = []
+            cuts = []
+            boundary = []
+            for v in cell:
+                vid = v.get_id()
+                for w in v.get_connections():
+                    wid = w.get_id()
+                    if cell_of[wid] == c:
+                        if vid < wid:
+                            inner.append((vid, wid, v.get_weight(w)))
+                    else:
+                        cuts.append((vid, wid, cell_of[wid], v.get_weight(w)))
+                        if not boundary or boundary[-1] != vid:
+                            boundary.append(vid)
+
+            _save_edges(os.path.join(directory, "cell_%d.txt" % c), inner)
+            shortcuts = [(vs, vd, c, co) for vs, vd, co in _shortcuts(inner, boundary)]
+            _save_boundary(os.path.join(directory, "boundary_%d.txt" % c), len(boundary), shortcuts + cuts)
+
+        return 1
+
+    except IOError:
+        print("Error: The partitioned graph cannot be written to the directory \"%s\"." % directory)
+        return 0
+
+    except ValueError:
+        print("Error: The size of the cells has to be positive.")
+        return 0
+
+    except Exception:
+        print("Error: The graph cannot be partitioned.")
+        return 0
+
+
+def _shortcuts(inner, boundary):
+    """
+    Calculates the shortcuts between the boundary nodes of a cell.
+    The shortcut between two boundary nodes is skipped if the minimal path between them passes through another
+    boundary node, since it is then composed of the other shortcuts.
+
+    :type inner: list
+    :param inner: the (first vertex id, second vertex id, weight) tuples of the arches of the cell
+
+    :type boundary: list
+    :param boundary: the ids of the boundary nodes of the cell
+
+    :rtype: list
+    :return: the (first vertex id, second vertex id, cost) tuples of the shortcuts
+    """
+
+    g = Graph()
+    for vs, vd, co in inner:
+        g.add_edge(vs, vd, co)
+
+    # the boundary nodes without any arch inside the cell have no shortcuts
+    boundary = [b for b in boundary if b in g.get_vertices()]
+    costs = {}
+    for b in boundary:
+        spf = SPF(g, b)
+        spf.minimal_paths()
+        costs[b] = {d: spf.get_cost(d) for d in boundary}
+
+    shortcuts = []
+    for i, a in enumerate(boundary):
+        for b in boundary[i + 1:]:
+            co = costs[a][b]
+            if co == math.inf:
+                continue
+            if any(0 < costs[a][m] and 0 < costs[m][b] and costs[a][m] + costs[m][b] <= co
+                   for m in boundary if m != a and m != b):
+                continue
+            shortcuts.append((a, b, co))
+
+    return shortcuts
+
+
+def _bucket(node, buckets):
+    """
+    Gets the number of the bucket file containing the cell of the given vertex.
+
+    :type node: str
+    :param node: the id of the vertex
+
+    :type buckets: int
+    :param buckets: the number of the bucket files
+
+    :rtype: int
+    :return: the number of the bucket file
+    """
+
+    return zlib.crc32(node.encode()) % buckets
+
+
+def _save_edges(filepath, edges):
+    """
+    Saves the given arches in the format of the input file.
+
+    :type filepath: str
+    :param filepath: the location of the output file
+
+    :type edges: list
+    :param edges: the (first vertex id, second vertex id, weight) tuples
+    """
+
+    nodes = set()
+    for vs, vd, co in edges:
+        nodes.add(vs)
+        nodes.add(vd)
+
+    with open(filepath, "w") as fp:
+        fp.write("NODES %d\nARCS\n" % len(nodes))
+        for vs, vd, co in edges:
+            fp.write("%s %s %r\n" % (vs, vd, float(co)))
+        fp.write("END\n")
+
+
+def _save_boundary(filepath, num, edges):
+    """
+    Saves the boundary file of a cell.
+
+    :type filepath: str
+    :param filepath: the location of the output file
+
+    :type num: int
+    :param num: the number of the boundary nodes of the cell
+
+    :type edges: list
+    :param edges: the (boundary node id, neighbor id, cell of the neighbor, cost) tuples of the shortcuts (stored once
+    for both of their ends) and of the arches leaving the cell
+    """
+
+    with open(filepath, "w") as fp:
+        fp.write("NODES %d\nARCS\n" % num)
+        for vs, vd, c, co in edges:
+            fp.write("%s %s %d %r\n" % (vs, vd, c, float(co)))
+        fp.write("END\n")
+
+
+def _save_index(directory, cell_of, num, buckets):
+    """
+    Saves the number of the cells and the assignment of the vertices to the cells in the bucket files.
+
+    :type directory: str
+    :param directory: the location of the output directory
+
+    :type cell_of: dict
+    :param cell_of: the pairs like (v : c) where v is the id of the vertex and c is the number of its cell
+
+    :type num: int
+    :param num: the number of the cells
+
+    :type buckets: int
+    :param buckets: the number of the bucket files
+    """
+
+    with open(os.path.join(directory, "cells.txt"), "w") as fp:
+        fp.write("CELLS %d\nBUCKETS %d\n" % (num, buckets))
+
+    contents = [[] for _ in range(buckets)]
+    for v, c in cell_of.items():
+        contents[_bucket(v, buckets)].append("%s %d\n" % (v, c))
+
+    for j, lines in enumerate(contents):
+        with open(os.path.join(directory, "bucket_%d.txt" % j), "w") as fp:
+            fp.write("VERTICES\n")
+            fp.writelines(lines)
+            fp.write("END\n")
+
+
+class PartitionedGraph:
+    """
+    The class representing a graph partitioned into cells saved on disk.
+    A query runs the SPF algorithm inside the cells of the source and the destination nodes and Dijkstra's algorithm
+    on the boundary nodes in between, reading the boundary files of the visited cells lazily.
+    The memory used by a query is bounded by max_cells cell graphs and max_boundaries boundary files plus the costs of
+    the boundary nodes visited by the search, which for a distant destination can be a large part of all the boundary
+    nodes. No structure covering all the vertices is loaded.
+    """
+
+    def __init__(self, directory, max_cells=2, max_boundaries=16):
+        """
+        The constructor of a new partitioned graph object.
+        By default at most two cells (the ones of the source and the destination nodes) and 16 boundary files are kept
+        in memory.
+
+        :type directory: str
+        :param directory: the location of the directory written by the partition_graph function
+
+        :type max_cells: int
+        :param max_cells: the maximal number of the cells kept in memory
+
+        :type max_boundaries: int
+        :param max_boundaries: the maximal number of the boundary files kept in memory
+        """
+
+        self.__directory = directory
+        self.__max_cells = max(2, max_cells)
+        self.__max_boundaries = max(1, max_boundaries)
+        self.__buckets = None
+        self.__cells = OrderedDict()
+        self.__boundaries = OrderedDict()
+
+    def __get_cell_of(self, node):
+        """
+        Gets the number of the cell of the given vertex from its bucket file.
+
+        :type node: str
+        :param node: the id of the vertex
+
+        :rtype: int
+        :return: the number of the cell
+        """
+
+        if self.__buckets is None:
+            with open(os.path.join(self.__directory, "cells.txt"), "r") as fp:
+                for line in fp:
+                    if line.split()[0] == "BUCKETS":
+                        self.__buckets = int(line.split()[1])
+
+        filepath = os.path.join(self.__directory, "bucket_%d.txt" % _bucket(node, self.__buckets))
+        with open(filepath, "r") as fp:
+            for line in fp:
+                entry = line.split()
+                if len(entry) == 2 and entry[0] == node:
+                    return int(entry[1])
+
+        raise IncorrectParametersError
+
+    @staticmethod
+    def __cached(cache, size, c, load):
+        """
+        Gets the given cell from the cache, loading it if it is not kept in memory.
+
+        :type cache: OrderedDict
+        :param cache: the cache of the least recently used cells
+
+        :type size: int
+        :param size: the maximal number of the cells kept in the cache
+
+        :type c: int
+        :param c: the number of the cell
+
+        :type load: function
+        :param load: the function loading the cell
+
+        :rtype: object
+        :return: the loaded cell
+        """
+
+        if c in cache:
+            cache.move_to_end(c)
+        else:
+            cache[c] = load(c)
+            if len(cache) > size:
+                cache.popitem(last=False)
+
+        return cache[c]
+
+    def __load_cell(self, c):
+        """
+        Loads the graph of the given cell.
+
+        :type c: int
+        :param c: the number of the cell
+
+        :rtype: Graph
+        :return: the graph of the cell
+        """
+
+        g = Graph()
+        if not g.load_graph(os.path.join(self.__directory, "cell_%d.txt" % c), 1):
+            raise LoadingError
+        return g
+
+    def __load_boundary(self, c):
+        """
+        Loads the boundary file of the given cell.
+
+        :type c: int
+        :param c: the number of the cell
+
+        :rtype: dict
+        :return: the pairs like (b : l) where b is the id of the boundary node and l is the list of the (neighbor id,
+        cell of the neighbor, cost) tuples
+        """
+
+        boundary = {}
+        with open(os.path.join(self.__directory, "boundary_%d.txt" % c), "r") as fp:
+            line = fp.readline()
+            while line:
+                if line.split()[0] == "ARCS":
+                    line = fp.readline()
+                    while line.split()[0] != "END":
+                        vs, vd, cd, co = line.split()
+                        boundary.setdefault(vs, []).append((vd, int(cd), float(co)))
+                        # the shortcuts are stored once for both of their ends
+                        if int(cd) == c:
+                            boundary.setdefault(vd, []).append((vs, c, float(co)))
+                        line = fp.readline()
+                line = fp.readline()
+
+        return boundary
+
+    def __search_cell(self, c, node):
+        """
+        Calculates the minimal paths inside the given cell from the given node.
+
+        :type c: int
+        :param c: the number of the cell
+
+        :type node: str
+        :param node: the id of the source node
+
+        :rtype: SPF
+        :return: the SPF object with the calculated minimal paths (None if the node has no arch inside the cell)
+        """
+
+        g = self.__cached(self.__cells, self.__max_cells, c, self.__load_cell)
+        if node not in g.get_vertices():
+            return None
+
+        spf = SPF(g, node)
+        spf.minimal_paths()
+        return spf
+
+    @staticmethod
+    def __cell_cost(spf, node, v):
+        """
+        Gets the cost of the minimal path inside the cell from the given node to the given vertex.
+
+        :type spf: SPF
+        :param spf: the SPF object returned by the __search_cell method
+
+        :type node: str
+        :param node: the id of the source node
+
+        :type v: str
+        :param v: the id of the destination vertex
+
+        :rtype: float
+        :return: the cost of the minimal path inside the cell
+        """
+
+        if spf is None or v not in spf.get_graph().get_vertices():
+            return 0 if v == node else math.inf
+
+        return spf.get_cost(v)
+
+    @staticmethod
+    def __cell_path(spf, node, v):
+        """
+        Gets the minimal path inside the cell from the given node to the given vertex.
+
+        :type spf: SPF
+        :param spf: the SPF object returned by the __search_cell method
+
+        :type node: str
+        :param node: the id of the source node
+
+        :type v: str
+        :param v: the id of the destination vertex
+
+        :rtype: list
+        :return: the ids of the vertices of the path
+        """
+
+        path = [v]
+        while path[-1] != node:
+            path.append(spf.get_previous_node(path[-1]))
+        path.reverse()
+        return path
+
+    def __search(self, frm, to):
+        """
+        Calculates the minimal path between the given nodes.
+
+        :type frm: str
+        :param frm: the id of the source node
+
+        :type to: str
+        :param to: the id of the destination node
+
+        :rtype: tuple
+        :return: the cost of the minimal path, the last boundary node of the path (None if the path does not leave the
+        cell), the pairs like (b : (p, c)) where p is the previous boundary node of b (None for the first one) and c is
+        the cell of the shortcut leading to b (None for an arch between the cells), and the SPF objects of the cells of
+        the source and the destination nodes
+        """
+
+        cs = self.__get_cell_of(frm)
+        ct = self.__get_cell_of(to)
+        source = self.__search_cell(cs, frm)
+        target = self.__search_cell(ct, to)
+
+        best = self.__cell_cost(source, frm, to) if cs == ct else math.inf
+        meet = None
+        costs = {}
+        parents = {}
+        heap = []
+        for b in self.__cached(self.__boundaries, self.__max_boundaries, cs, self.__load_boundary):
+            co = self.__cell_cost(source, frm, b)
+            if co != math.inf:
+                costs[b] = co
+                parents[b] = (None, cs)
+                heap.append((co, b, cs))
+        heapq.heapify(heap)
+
+        # Dijkstra's algorithm on the boundary nodes
+        while heap:
+            co, u, cu = heapq.heappop(heap)
+            if co >= best:
+                break
+            if co > costs[u]:
+                continue
+
+            if cu == ct:
+                total = co + self.__cell_cost(target, to, u)
+                if total < best:
+                    best = total
+                    meet = u
+
+            boundary = self.__cached(self.__boundaries, self.__max_boundaries, cu, self.__load_boundary)
+            for v, cv, weight in boundary.get(u, ()):
+                if co + weight < costs.get(v, math.inf):
+                    costs[v] = co + weight
+                    parents[v] = (u, cu if cv == cu else None)
+                    heapq.heappush(heap, (co + weight, v, cv))
+
+        return best, meet, parents, source, target
+
+    def get_cost(self, frm, to):
+        """
+        Gets the cost of the minimal path between the given nodes.
+
+        :type frm: str
+        :param frm: the id of the source node
+
+        :type to: str
+        :param to: the id of the destination node
+
+        :rtype: float
+        :return: the cost of the minimal path between the given nodes
+        """
+
+        try:
+            return self.__search(frm, to)[0]
+
+        except IncorrectParametersError:
+            print("Error: The \"%s\" or \"%s\" node is not a part of the given graph." % (frm, to))
+            return math.inf
+
+        except Exception:
+            print("Error: The cost from the node \"%s\" to the node \"%s\" cannot be returned." % (frm, to))
+            return math.inf
+
+    def get_path(self, frm, to):
+        """
+        Gets the minimal path between the given nodes.
+        The shortcuts of the path are expanded with the minimal paths inside their cells.
+
+        :type frm: str
+        :param frm: the id of the source node
+
+        :type to: str
+        :param to: the id of the destination node
+
+        :rtype: str
+        :return: the minimal path between the given nodes
+        """
+
+        try:
+            best, meet, parents, source, target = self.__search(frm, to)
+            if best == math.inf:
+                raise IncorrectParametersError
+
+            if meet is None:
+                # the path does not leave the cell
+                path = self.__cell_path(source, frm, to) if frm != to else [frm]
+            else:
+                hops = [meet]
+                while parents[hops[-1]][0] is not None:
+                    hops.append(parents[hops[-1]][0])
+                hops.reverse()
+
+                path = self.__cell_path(source, frm, hops[0]) if frm != hops[0] else [frm]
+                for a, b in zip(hops, hops[1:]):
+                    c = parents[b][1]
+                    if c is None:
+                        # the arch between the cells
+                        path.append(b)
+                    else:
+                        path.extend(self.__cell_path(self.__search_cell(c, a), a, b)[1:])
+
+                if meet != to:
+                    path.extend(reversed(self.__cell_path(target, to, meet)[:-1]))
+
+            return "Path: [" + " -> ".join(path) + "] Cost: " + str(best)
+
+        except IncorrectParametersError:
+            print("Error: The minimal path from the node \"%s\" to the node \"%s\" does not exist." % (frm, to))
+            return ""
+
+        except Exception:
+            print("Error: The minimal path from the node \"%s\" to the node \"%s\" cannot be returned." % (frm, to))
+            return ""
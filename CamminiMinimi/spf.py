@@ -73,6 +73,10 @@ class SPF:
                         if self.__costs[node] < minimum:
                             minimum = self.__costs[node]
                             minimum_node = node
+
+                    # the remaining nodes cannot be reached from the source node
+                    if minimum_node is None:
+                        break
                     v = self.__graph.get_vert_dict().get(minimum_node)
 
                     # remove the element with the lowest cost
@@ -125,6 +129,47 @@ class SPF:
             print("Error: The cost to the node \"%s\" cannot be returned." % node)
             return math.inf
 
+    def get_previous_node(self, node):
+        """
+        Gets the id of the node preceding the given destination node on the minimal path from the source node.
+
+        :type node: str
+        :param node: the id of the destination node
+
+        :rtype: str
+        :return: the id of the previous node (None if the node cannot be reached from the source node)
+        """
+
+        try:
+            if self.__previous == {}:
+                raise UnknownCostError
+            elif node not in self.__graph.get_vertices():
+                raise IncorrectParametersError
+
+            return self.__previous.get(node)
+
+        except UnknownCostError:
+            print("Error: The minimal paths has not been calculated.")
+            return None
+
+        except IncorrectParametersError:
+            print("Error: The \"%s\" node is not a part of the given graph." % node)
+            return None
+
+        except Exception:
+            print("Error: The previous node of the node \"%s\" cannot be returned." % node)
+            return None
+
+    def is_calculated(self):
+        """
+        Checks whether the minimal paths have been calculated.
+
+        :rtype: bool
+        :return: True if the minimal paths have been calculated, False otherwise
+        """
+
+        return self.__costs != {} and self.__previous != {}
+
     def get_costs(self):
         """
         Gets the costs of all the possible minimal paths form the source node in the graph.
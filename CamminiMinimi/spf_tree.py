@@ -0,0 +1,469 @@
+import hashlib
+import math
+import mmap
+import struct
+import sys
+from array import array
+
+from spf import UnknownCostError, IncorrectParametersError
+
+# the header of the tree file: the magic number, the type of the costs, the number of vertices, the source number and
+# the fingerprint of the vertex index (the size is a multiple of 8 so that the arrays are aligned)
+HEADER = struct.Struct("<8s1s7xqq8s")
+MAGIC = b"SPFTREE2"
+
+# the cost of the unreachable vertices in the trees with integer costs
+UNREACHABLE = -1
+
+
+class VertexIndex:
+    """
+    The class representing the numbering of the vertices of a graph shared by the SPF trees.
+    The index is built once per graph and every tree keeps only the arrays indexed by these numbers.
+    """
+
+    def __init__(self, vertices):
+        """
+        The constructor of a new vertex index object.
+
+        :type vertices: list
+        :param vertices: the ids of the vertices ordered by their numbers
+        """
+
+        self.__vertices = vertices
+        self.__numbers = {v: i for i, v in enumerate(vertices)}
+        self.__fingerprint = hashlib.blake2b("\n".join(vertices).encode(), digest_size=8).digest()
+
+    @staticmethod
+    def from_graph(graph):
+        """
+        Creates the vertex index of the given graph, sharing the ids of its vertices.
+
+        :type graph: Graph
+        :param graph: the graph to be considered
+
+        :rtype: VertexIndex
+        :return: the vertex index of the graph
+        """
+
+        return VertexIndex(list(graph.get_vertices()))
+
+    def get_number(self, node):
+        """
+        Gets the number of the vertex with the given id.
+
+        :type node: str
+        :param node: the id of the vertex
+
+        :rtype: int
+        :return: the number of the vertex
+        """
+
+        if node not in self.__numbers:
+            raise IncorrectParametersError
+
+        return self.__numbers[node]
+
+    def get_id(self, number):
+        """
+        Gets the id of the vertex with the given number.
+
+        :type number: int
+        :param number: the number of the vertex
+
+        :rtype: str
+        :return: the id of the vertex
+        """
+
+        return self.__vertices[number]
+
+    def get_vertices(self):
+        """
+        Gets the ids of all the vertices ordered by their numbers.
+
+        :rtype: list
+        :return: the ids of all the vertices
+        """
+
+        return self.__vertices
+
+    def get_fingerprint(self):
+        """
+        Gets the fingerprint of the index identifying the numbering of the vertices.
+
+        :rtype: bytes
+        :return: the fingerprint of the index
+        """
+
+        return self.__fingerprint
+
+    def save(self, filepath):
+        """
+        Saves the vertex index to the txt file.
+
+        :type filepath: str
+        :param filepath: the location of the output file
+
+        :rtype: int
+        :return: the flag describing whether the index has been saved (1) or not (0)
+        """
+
+        try:
+            with open(filepath, "w") as fp:
+                fp.write("VERTICES %d\n" % len(self.__vertices))
+                for v in self.__vertices:
+                    fp.write(v + "\n")
+                fp.write("END\n")
+
+            return 1
+
+        except IOError:
+            print("Error: The file cannot be written.")
+            return 0
+
+        except Exception:
+            print("Error: The vertex index cannot be saved.")
+            return 0
+
+    @staticmethod
+    def load(filepath):
+        """
+        Loads the vertex index from the txt file.
+
+        :type filepath: str
+        :param filepath: the location of the input file
+
+        :rtype: VertexIndex
+        :return: the loaded vertex index (None if the index cannot be loaded)
+        """
+
+        try:
+            with open(filepath, "r") as fp:
+                lines = fp.read().split("\n")
+
+            if lines[0].split()[0] != "VERTICES":
+                raise TreeFormatError
+            num = int(lines[0].split()[1])
+            if len(lines) < num + 2 or lines[num + 1] != "END":
+                raise TreeFormatError
+
+            return VertexIndex([sys.intern(v) for v in lines[1:num + 1]])
+
+        except IOError:
+            print("Error: The file does not appear to exist.")
+            return None
+
+        except (TreeFormatError, IndexError, ValueError):
+            print("Error: The format of the input file is incorrect.")
+            return None
+
+        except Exception:
+            print("Error: The vertex index cannot be loaded.")
+            return None
+
+
+class SPFTree:
+    """
+    The class representing a compact shortest path tree computed by Dijkstra's Shortest Path First (SPF) algorithm.
+    The costs and the previous vertices are kept in arrays indexed by the numbers of the shared vertex index.
+    """
+
+    def __init__(self, index, source, costs, previous):
+        """
+        The constructor of a new SPF tree object.
+
+        :type index: VertexIndex
+        :param index: the numbering of the vertices
+
+        :type source: int
+        :param source: the number of the source node
+
+        :type costs: array
+        :param costs: the costs of the minimal paths indexed by the numbers of the vertices, either doubles (infinite if
+        the vertex cannot be reached) or 64-bit integers (UNREACHABLE if the vertex cannot be reached)
+
+        :type previous: array
+        :param previous: the numbers of the previous vertices on the minimal paths (-1 if the vertex cannot be
+        reached) indexed by the numbers of the vertices (32-bit integers)
+        """
+
+        self.__index = index
+        self.__source = source
+        self.__costs = costs
+        self.__typecode = costs.format if isinstance(costs, memoryview) else costs.typecode
+        self.__previous = previous
+        self.__mmap = None
+
+    @staticmethod
+    def from_spf(spf, index=None):
+        """
+        Creates the SPF tree from the calculated minimal paths of the given SPF object.
+        The costs are kept as integers if all of them are integers (e.g. for the graph which is not weighted).
+
+        :type spf: SPF
+        :param spf: the SPF object with the calculated minimal paths
+
+        :type index: VertexIndex
+        :param index: the numbering of the vertices of the graph (by default a new one is created)
+
+        :rtype: SPFTree
+        :return: the SPF tree (None if the minimal paths has not been calculated)
+        """
+
+        try:
+            if not spf.is_calculated():
+                raise UnknownCostError
+
+            if index is None:
+                index = VertexIndex.from_graph(spf.get_graph())
+            vertices = index.get_vertices()
+            if len(vertices) != spf.get_graph().get_num_vertices():
+                raise IncorrectParametersError
+
+            costs = [spf.get_cost(v) for v in vertices]
+            if all(isinstance(co, int) or co == math.inf for co in costs):
+                costs = array("q", (UNREACHABLE if co == math.inf else co for co in costs))
+            else:
+                costs = array("d", costs)
+
+            previous = array("i", (-1 if p is None else index.get_number(p)
+                                   for p in (spf.get_previous_node(v) for v in vertices)))
+
+            return SPFTree(index, index.get_number(spf.get_source_node()), costs, previous)
+
+        except UnknownCostError:
+            print("Error: The minimal paths has not been calculated.")
+            return None
+
+        except IncorrectParametersError:
+            print("Error: The vertex index does not match the graph.")
+            return None
+
+        except Exception:
+            print("Error: The SPF tree cannot be created.")
+            return None
+
+    def __cost(self, n):
+        """
+        Gets the cost of the minimal path from the source node to the vertex with the given number.
+
+        :type n: int
+        :param n: the number of the vertex
+
+        :rtype: float
+        :return: the cost of the minimal path
+        """
+
+        co = self.__costs[n]
+        if self.__typecode == "q":
+            return math.inf if co == UNREACHABLE else co
+
+        # by the convention the cost to reach the source node is equal to 0
+        return 0 if n == self.__source else co
+
+    def get_cost(self, node):
+        """
+        Gets the cost of the minimal path from the source node to the given destination node.
+
+        :type node: str
+        :param node: the id of the destination node
+
+        :rtype: float
+        :return: the cost of the minimal path from the source node to the given node
+        """
+
+        try:
+            return self.__cost(self.__index.get_number(node))
+
+        except IncorrectParametersError:
+            print("Error: The \"%s\" node is not a part of the given graph." % node)
+            return math.inf
+
+        except Exception:
+            print("Error: The cost to the node \"%s\" cannot be returned." % node)
+            return math.inf
+
+    def get_path(self, node):
+        """
+        Gets the minimal path form the source node to the given destination node.
+
+        :type node: str
+        :param node: the id of the destination node
+
+        :rtype: str
+        :return: the minimal path from the source node to the given node
+        """
+
+        try:
+            n = self.__index.get_number(node)
+            path = [node]
+            while n != self.__source:
+                n = self.__previous[n]
+                if n < 0:
+                    raise UnknownCostError
+                path.append(self.__index.get_id(n))
+
+            return "Path: [" + " -> ".join(reversed(path)) + "] Cost: " + str(self.get_cost(node))
+
+        except IncorrectParametersError:
+            print("Error: The \"%s\" node is not a part of the given graph." % node)
+            return ""
+
+        except Exception:
+            print("Error: The minimal path from the node \"%s\" to the node \"%s\" cannot be returned."
+                  % (self.get_source_node(), node))
+            return ""
+
+    def get_paths(self):
+        """
+        Gets all the possible minimal paths form the source node in the graph.
+
+        :rtype: str
+        :return: all the possible minimal paths form the source node
+        """
+
+        paths = "Paths:\n"
+        for p in self.__index.get_vertices():
+            paths = paths + self.get_path(p) + "\n"
+        return paths.rstrip("\n")
+
+    def get_source_node(self):
+        """
+        Gets the id of the source node.
+
+        :rtype: str
+        :return: the id of the source node
+        """
+
+        return self.__index.get_id(self.__source)
+
+    def get_index(self):
+        """
+        Gets the numbering of the vertices of the tree.
+
+        :rtype: VertexIndex
+        :return: the vertex index
+        """
+
+        return self.__index
+
+    def is_affected(self, touched):
+        """
+        Checks whether the tree may be outdated after the changes of the graph touching the given vertices
+        (e.g. the ones returned by the Graph.apply_delta method).
+        The check is conservative: the tree is affected if any touched vertex is reachable from the source node or is
+        not a part of the tree.
+
+        :type touched: list
+        :param touched: the ids of the touched vertices
+
+        :rtype: bool
+        :return: True if the tree has to be recalculated, False otherwise
+        """
+
+        for node in touched:
+            try:
+                if self.__cost(self.__index.get_number(node)) != math.inf:
+                    return True
+            except IncorrectParametersError:
+                return True
+
+        return False
+
+    def save(self, filepath):
+        """
+        Saves the SPF tree to the binary file. The vertex index is not saved with the tree, only its fingerprint.
+        The arrays are stored in the little-endian byte order and aligned so that they can be mapped into memory.
+
+        :type filepath: str
+        :param filepath: the location of the output file
+
+        :rtype: int
+        :return: the flag describing whether the tree has been saved (1) or not (0)
+        """
+
+        try:
+            costs = array(self.__typecode, self.__costs)
+            previous = array("i", self.__previous)
+            if sys.byteorder != "little":
+                costs.byteswap()
+                previous.byteswap()
+
+            with open(filepath, "wb") as fp:
+                fp.write(HEADER.pack(MAGIC, self.__typecode.encode(), len(previous), self.__source,
+                                     self.__index.get_fingerprint()))
+                costs.tofile(fp)
+                previous.tofile(fp)
+
+            return 1
+
+        except IOError:
+            print("Error: The file cannot be written.")
+            return 0
+
+        except Exception:
+            print("Error: The SPF tree cannot be saved.")
+            return 0
+
+    @staticmethod
+    def load(filepath, index):
+        """
+        Loads the SPF tree from the binary file by mapping it into memory, so the arrays are not copied.
+
+        :type filepath: str
+        :param filepath: the location of the input file
+
+        :type index: VertexIndex
+        :param index: the numbering of the vertices the tree has been saved with
+
+        :rtype: SPFTree
+        :return: the loaded SPF tree (None if the tree cannot be loaded)
+        """
+
+        try:
+            with open(filepath, "rb") as fp:
+                mm = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+            magic, typecode, num, source, fingerprint = HEADER.unpack_from(mm)
+            typecode = typecode.decode()
+            if magic != MAGIC or typecode not in ("d", "q") or HEADER.size + 12 * num != len(mm):
+                raise TreeFormatError
+            if fingerprint != index.get_fingerprint() or num != len(index.get_vertices()):
+                raise IncorrectParametersError
+
+            end = HEADER.size + 8 * num
+            view = memoryview(mm)
+            costs = view[HEADER.size:end].cast(typecode)
+            previous = view[end:end + 4 * num].cast("i")
+            if sys.byteorder != "little":
+                costs = array(typecode, costs)
+                costs.byteswap()
+                previous = array("i", previous)
+                previous.byteswap()
+
+            tree = SPFTree(index, source, costs, previous)
+            tree.__mmap = mm
+            return tree
+
+        except IOError:
+            print("Error: The file does not appear to exist.")
+            return None
+
+        except TreeFormatError:
+            print("Error: The format of the input file is incorrect.")
+            return None
+
+        except IncorrectParametersError:
+            print("Error: The SPF tree has been saved with a different vertex index.")
+            return None
+
+        except Exception:
+            print("Error: The SPF tree cannot be loaded.")
+            return None
+
+
+class TreeFormatError(Exception):
+    """ The file does not contain a correct SPF tree. """
+
+    def __init__(self):
+        self.args = ("The file does not contain a correct SPF tree.",)